@@ -55,8 +55,10 @@
 #  then it will also become the 'to' address as well.
 #
 import requests
+from functools import lru_cache
 from email.utils import formataddr
 from .base import NotifyBase
+from ..url import HTML_LOOKUP
 from ..common import NotifyType
 from ..common import NotifyFormat
 from ..utils import parse_emails
@@ -76,6 +78,10 @@ MAILGUN_HTTP_ERROR_MAP = {
     413: 'Provided attachment is to big.',
 }
 
+# Our complete response code lookup table; built once so that our error
+# handling doesn't have to merge it on every failed request
+MAILGUN_HTTP_LOOKUP = {**HTML_LOOKUP, **MAILGUN_HTTP_ERROR_MAP}
+
 
 # Priorities
 class MailgunRegion:
@@ -96,6 +102,16 @@ MAILGUN_REGIONS = (
 )
 
 
+@lru_cache(maxsize=4096)
+def _format_addr(name, email):
+    """
+    Returns the formatted (Name <email>) address; the same recipients are
+    formatted over and over again with each notification sent, so the
+    results are cached.
+    """
+    return formataddr((name, email), charset='utf-8')
+
+
 class NotifyMailgun(NotifyBase):
     """
     A wrapper for Mailgun Notifications
@@ -257,21 +273,23 @@ class NotifyMailgun(NotifyBase):
         self.batch = batch
 
         # Store our region
-        try:
-            self.region_name = \
-                NotifyMailgun.template_args['region']['default'] \
-                if region_name is None else region_name.lower()
-
-            if self.region_name not in MAILGUN_REGIONS:
-                # allow the outer except to handle this common response
-                raise
-        except:
+        self.region_name = \
+            NotifyMailgun.template_args['region']['default'] \
+            if region_name is None else (
+                region_name.lower() if isinstance(region_name, str)
+                else None)
+
+        if self.region_name not in MAILGUN_REGIONS:
             # Invalid region specified
             msg = 'The Mailgun region specified ({}) is invalid.' \
                   .format(region_name)
             self.logger.warning(msg)
             raise TypeError(msg)
 
+        # Prepare our URL as it's based on our hostname and region
+        self.notify_url = '{}{}/messages'.format(
+            MAILGUN_API_LOOKUP[self.region_name], self.host)
+
         # Get our From username (if specified)
         self.from_addr = [
             self.app_id, '{user}@{host}'.format(
@@ -384,29 +402,24 @@ class NotifyMailgun(NotifyBase):
                     'Preparing Mailgun attachment {}'.format(
                         attachment.url(privacy=True)))
                 try:
-                    files['attachment[{}]'.format(idx)] = \
-                        (attachment.name, open(attachment.path, 'rb'))
+                    # Read our attachment once; the same content is then
+                    # re-used by every batch we send
+                    with open(attachment.path, 'rb') as f:
+                        files['attachment[{}]'.format(idx)] = \
+                            (attachment.name, f.read())
 
                 except (OSError, IOError) as e:
                     self.logger.warning(
-                        'An I/O error occurred while opening {}.'.format(
+                        'An I/O error occurred while reading {}.'.format(
                             attachment.name if attachment
                             else 'attachment'))
                     self.logger.debug('I/O Exception: %s' % str(e))
-
-                    # tidy up any open files before we make our early
-                    # return
-                    for entry in files.values():
-                        self.logger.trace(
-                            'Closing attachment {}'.format(entry[0]))
-                        entry[1].close()
-
                     return False
 
-        reply_to = formataddr(self.from_addr, charset='utf-8')
+        reply_to = _format_addr(*self.from_addr)
 
-        # Prepare our payload
-        payload = {
+        # Prepare the portion of our payload that is common to every batch
+        base_payload = {
             # pass skip-verification switch upstream too
             'o:skip-verification': not self.verify_certificate,
 
@@ -416,167 +429,133 @@ class NotifyMailgun(NotifyBase):
         }
 
         if self.notify_format == NotifyFormat.HTML:
-            payload['html'] = body
+            base_payload['html'] = body
 
         else:
-            payload['text'] = body
+            base_payload['text'] = body
+
+        # Store our token entries; users can reference these as %value%
+        # in their email message.
+        if self.tokens:
+            base_payload.update(
+                {'v:{}'.format(k): v for k, v in self.tokens.items()})
+
+        # Store our header entries if defined into the payload
+        # in their payload
+        if self.headers:
+            base_payload.update(
+                {'h:{}'.format(k): v for k, v in self.headers.items()})
+
+        # Our Carbon Copy and Blind Carbon Copy lists do not change from one
+        # batch to the next; prepare them once.  A Blind Carbon Copy always
+        # takes priority over a Carbon Copy.
+        base_cc = self.cc - self.bcc
+
+        # Format our cc addresses to support the Name field
+        formatted_cc = {
+            addr: _format_addr(self.names.get(addr, False), addr)
+            for addr in base_cc}
+
+        # Re-use a single connection (keep-alive) across all of our batches
+        # rather than performing a new TLS handshake for each and every one
+        with requests.Session() as session:
+            for index in range(0, len(self.targets), batch_size):
+                # Acquire our batch of targets
+                batch = self.targets[index:index + batch_size]
 
-        # Prepare our URL as it's based on our hostname
-        url = '{}{}/messages'.format(
-            MAILGUN_API_LOOKUP[self.region_name], self.host)
+                # Prepare our `to`
+                to = [_format_addr(*to_addr) for to_addr in batch]
 
-        # Create a copy of the targets list
-        emails = list(self.targets)
+                # Track the addresses found in our To
+                emails = [to_addr[1] for to_addr in batch]
 
-        for index in range(0, len(emails), batch_size):
-            # Initialize our cc list
-            cc = (self.cc - self.bcc)
+                # Strip our To targets out of our cc and bcc lists
+                to_addrs = set(emails)
+                cc = base_cc - to_addrs
+                bcc = self.bcc - to_addrs
 
-            # Initialize our bcc list
-            bcc = set(self.bcc)
+                # Prepare our payload and To
+                payload = dict(base_payload)
+                payload['to'] = ','.join(to)
 
-            # Initialize our to list
-            to = list()
+                if cc:
+                    payload['cc'] = ','.join(
+                        [formatted_cc[addr] for addr in cc])
 
-            # Ensure we're pointed to the head of the attachment; this doesn't
-            # do much for the first iteration through this loop as we're
-            # already pointing there..., but it allows us to re-use the
-            # attachment over and over again without closing and then
-            # re-opening the same file again and again
-            for entry in files.values():
-                try:
-                    self.logger.trace(
-                        'Seeking to head of attachment {}'.format(entry[0]))
-                    entry[1].seek(0)
+                # Format our bcc addresses to support the Name field
+                if bcc:
+                    payload['bcc'] = ','.join(bcc)
 
-                except (OSError, IOError) as e:
+                # Some Debug Logging
+                self.logger.debug(
+                    'Mailgun POST URL: {} (cert_verify={})'.format(
+                        self.notify_url, self.verify_certificate))
+                self.logger.debug('Mailgun Payload: {}' .format(payload))
+
+                # For logging output of success and errors; we get a head count
+                # of our outbound details:
+                verbose_dest = ', '.join(emails) \
+                    if len(emails) <= 3 \
+                    else '{} recipients'.format(len(emails))
+
+                # Always call throttle before any remote server i/o is made
+                self.throttle()
+                try:
+                    r = session.post(
+                        self.notify_url,
+                        auth=("api", self.apikey),
+                        data=payload,
+                        headers=headers,
+                        files=None if not files else files,
+                        verify=self.verify_certificate,
+                        timeout=self.request_timeout,
+                    )
+
+                    if r.status_code != requests.codes.ok:
+                        # We had a problem
+                        status_str = \
+                            MAILGUN_HTTP_LOOKUP.get(r.status_code, '')
+
+                        self.logger.warning(
+                            'Failed to send Mailgun notification to {}: '
+                            '{}{}error={}.'.format(
+                                verbose_dest,
+                                status_str,
+                                ', ' if status_str else '',
+                                r.status_code))
+
+                        self.logger.debug(
+                            'Response Details:\r\n{}'.format(r.content))
+
+                        # Mark our failure
+                        has_error = True
+                        continue
+
+                    else:
+                        self.logger.info(
+                            'Sent Mailgun notification to {}.'.format(
+                                verbose_dest))
+
+                except requests.RequestException as e:
                     self.logger.warning(
-                        'An I/O error occurred seeking to head of attachment '
-                        '{}.'.format(entry[0]))
-                    self.logger.debug('I/O Exception: %s' % str(e))
-
-                    # tidy up any open files before we make our early
-                    # return
-                    for entry in files.values():
-                        self.logger.trace(
-                            'Closing attachment {}'.format(entry[0]))
-                        entry[1].close()
-
-                    return False
-
-            for to_addr in self.targets[index:index + batch_size]:
-                # Strip target out of cc list if in To
-                cc = (cc - set([to_addr[1]]))
+                        'A Connection error occurred sending Mailgun:%s ' % (
+                            verbose_dest) + 'notification.'
+                    )
+                    self.logger.debug('Socket Exception: %s' % str(e))
 
-                # Strip target out of bcc list if in To
-                bcc = (bcc - set([to_addr[1]]))
-
-                # Prepare our `to`
-                to.append(formataddr(to_addr, charset='utf-8'))
-
-            # Prepare our To
-            payload['to'] = ','.join(to)
-
-            if cc:
-                # Format our cc addresses to support the Name field
-                payload['cc'] = ','.join([formataddr(
-                    (self.names.get(addr, False), addr), charset='utf-8')
-                    for addr in cc])
-
-            # Format our bcc addresses to support the Name field
-            if bcc:
-                payload['bcc'] = ','.join(bcc)
-
-            # Store our token entries; users can reference these as %value%
-            # in their email message.
-            if self.tokens:
-                payload.update(
-                    {'v:{}'.format(k): v for k, v in self.tokens.items()})
-
-            # Store our header entries if defined into the payload
-            # in their payload
-            if self.headers:
-                payload.update(
-                    {'h:{}'.format(k): v for k, v in self.headers.items()})
-
-            # Some Debug Logging
-            self.logger.debug('Mailgun POST URL: {} (cert_verify={})'.format(
-                url, self.verify_certificate))
-            self.logger.debug('Mailgun Payload: {}' .format(payload))
-
-            # For logging output of success and errors; we get a head count
-            # of our outbound details:
-            verbose_dest = ', '.join(
-                [x[1] for x in self.targets[index:index + batch_size]]) \
-                if len(self.targets[index:index + batch_size]) <= 3 \
-                else '{} recipients'.format(
-                    len(self.targets[index:index + batch_size]))
-
-            # Always call throttle before any remote server i/o is made
-            self.throttle()
-            try:
-                r = requests.post(
-                    url,
-                    auth=("api", self.apikey),
-                    data=payload,
-                    headers=headers,
-                    files=None if not files else files,
-                    verify=self.verify_certificate,
-                    timeout=self.request_timeout,
-                )
-
-                if r.status_code != requests.codes.ok:
-                    # We had a problem
-                    status_str = \
-                        NotifyBase.http_response_code_lookup(
-                            r.status_code, MAILGUN_HTTP_ERROR_MAP)
+                    # Mark our failure
+                    has_error = True
+                    continue
 
+                except (OSError, IOError) as e:
                     self.logger.warning(
-                        'Failed to send Mailgun notification to {}: '
-                        '{}{}error={}.'.format(
-                            verbose_dest,
-                            status_str,
-                            ', ' if status_str else '',
-                            r.status_code))
-
-                    self.logger.debug(
-                        'Response Details:\r\n{}'.format(r.content))
+                        'An I/O error occurred sending Mailgun notification')
+                    self.logger.debug('I/O Exception: %s' % str(e))
 
                     # Mark our failure
                     has_error = True
                     continue
 
-                else:
-                    self.logger.info(
-                        'Sent Mailgun notification to {}.'.format(
-                            verbose_dest))
-
-            except requests.RequestException as e:
-                self.logger.warning(
-                    'A Connection error occurred sending Mailgun:%s ' % (
-                        verbose_dest) + 'notification.'
-                )
-                self.logger.debug('Socket Exception: %s' % str(e))
-
-                # Mark our failure
-                has_error = True
-                continue
-
-            except (OSError, IOError) as e:
-                self.logger.warning(
-                    'An I/O error occurred while reading attachments')
-                self.logger.debug('I/O Exception: %s' % str(e))
-
-                # Mark our failure
-                has_error = True
-                continue
-
-        # Close any potential attachments that are still open
-        for entry in files.values():
-            self.logger.trace(
-                'Closing attachment {}'.format(entry[0]))
-            entry[1].close()
-
         return not has_error
 
     def url(self, privacy=False, *args, **kwargs):
@@ -607,8 +586,8 @@ class NotifyMailgun(NotifyBase):
             # Handle our Carbon Copy Addresses
             params['cc'] = ','.join(
                 ['{}{}'.format(
-                    '' if not e not in self.names
-                    else '{}:'.format(self.names[e]), e) for e in self.cc])
+                    '{}:'.format(self.names[e]) if self.names.get(e)
+                    else '', e) for e in self.cc])
 
         if self.bcc:
             # Handle our Blind Carbon Copy Addresses
@@ -48,10 +48,8 @@
 #   - https://www.reddit.com/dev/api/#POST_api_submit
 #   - https://github.com/reddit-archive/reddit/wiki/API
 import requests
+import time
 from json import loads
-from datetime import timedelta
-from datetime import datetime
-from datetime import timezone
 
 from .base import NotifyBase
 from ..url import PrivacyMode
@@ -130,10 +128,10 @@ class NotifyReddit(NotifyBase):
     request_rate_per_sec = 0
 
     # Taken right from google.auth.helpers:
-    clock_skew = timedelta(seconds=10)
+    clock_skew = 10
 
     # 1 hour in seconds (the lifetime of our token)
-    access_token_lifetime_sec = timedelta(seconds=3600)
+    access_token_lifetime_sec = 3600
 
     # Define object templates
     templates = (
@@ -266,7 +264,7 @@ class NotifyReddit(NotifyBase):
         # Our keys we build using the provided content
         self.__refresh_token = None
         self.__access_token = None
-        self.__access_token_expiry = datetime.now(timezone.utc)
+        self.__access_token_expiry = time.time()
 
         self.kind = kind.strip().lower() \
             if isinstance(kind, str) \
@@ -308,20 +306,34 @@ class NotifyReddit(NotifyBase):
             self.logger.warning(msg)
             raise TypeError(msg)
 
-        # Build list of subreddits
-        self.subreddits = [
-            sr.lstrip('#') for sr in parse_list(targets) if sr.lstrip('#')]
+        # Build list of subreddits; a leading hashtag is optional so we
+        # de-duplicate once it has been stripped (order is preserved)
+        subreddits = {}
+        for sr in parse_list(targets):
+            sr = sr.lstrip('#')
+            if sr:
+                subreddits[sr] = None
+
+        self.subreddits = list(subreddits)
 
         if not self.subreddits:
             self.logger.warning(
                 'No subreddits were identified to be notified')
 
-        # For Rate Limit Tracking Purposes
-        self.ratelimit_reset = datetime.now(timezone.utc).replace(tzinfo=None)
+        # For Rate Limit Tracking Purposes; this is the epoch time (in
+        # seconds) our rate limit is reset at
+        self.ratelimit_reset = time.time()
 
         # Default to 1.0
         self.ratelimit_remaining = 1.0
 
+        # Our headers and credentials only change when our token rotates
+        self._base_headers = {
+            'User-Agent': '{} v{}'.format(__title__, __version__)
+        }
+        self._basic_auth = (self.client_id, self.client_secret)
+        self._bearer_headers = None
+
         return
 
     def url(self, privacy=False, *args, **kwargs):
@@ -371,17 +383,29 @@ class NotifyReddit(NotifyBase):
         """
         return len(self.subreddits)
 
-    def login(self):
+    def login(self, session=None):
         """
         A simple wrapper to authenticate with the Reddit Server
+
+        An open requests.Session can be provided so that our authentication
+        shares its connection with the requests that follow it
         """
 
-        # Prepare our payload
-        payload = {
-            'grant_type': 'password',
-            'username': self.user,
-            'password': self.password,
-        }
+        if self.__refresh_token:
+            # Renew our access token using the refresh token we were
+            # previously given; this spares us from sending our credentials
+            payload = {
+                'grant_type': 'refresh_token',
+                'refresh_token': self.__refresh_token,
+            }
+
+        else:
+            # Prepare our payload
+            payload = {
+                'grant_type': 'password',
+                'username': self.user,
+                'password': self.password,
+            }
 
         # Enforce a False flag setting before calling _fetch()
         self.__access_token = False
@@ -390,14 +414,9 @@ class NotifyReddit(NotifyBase):
         postokay, response = self._fetch(
             self.auth_url,
             payload=payload,
+            session=session,
         )
 
-        if not postokay or not response:
-            # Setting this variable to False as a way of letting us know
-            # we failed to authenticate on our last attempt
-            self.__access_token = False
-            return False
-
         # Our response object looks like this (content has been altered for
         # presentation purposes):
         # {
@@ -407,32 +426,46 @@ class NotifyReddit(NotifyBase):
         #     "scope": A scope string,
         #     "refresh_token": Your refresh token
         # }
+        #
+        # A rejected grant may still be answered with a 200; in that case
+        # our response carries an error (such as 'invalid_grant') and no
+        # access token
+        access_token = response.get('access_token') \
+            if postokay and response else None
+
+        if not access_token:
+            # Setting this variable to False as a way of letting us know
+            # we failed to authenticate on our last attempt
+            self.__access_token = False
+
+            if self.__refresh_token:
+                # Our refresh token is no longer accepted; fall back to
+                # authenticating with our credentials
+                self.__refresh_token = None
+                return self.login(session=session)
+
+            self.logger.warning(
+                'Failed to authenticate to Reddit as {}'.format(self.user))
+
+            # Mark our failure
+            return False
 
         # Acquire our token
-        self.__access_token = response.get('access_token')
+        self.__access_token = access_token
+        self._bearer_headers = dict(self._base_headers, **{
+            'Authorization': 'Bearer {}'.format(self.__access_token),
+        })
 
-        # Handle other optional arguments we can use
-        if 'expires_in' in response:
-            delta = timedelta(seconds=int(response['expires_in']))
-            self.__access_token_expiry = \
-                delta + datetime.now(timezone.utc) - self.clock_skew
-        else:
-            self.__access_token_expiry = self.access_token_lifetime_sec + \
-                datetime.now(timezone.utc) - self.clock_skew
+        # Track our expiry as epoch seconds
+        self.__access_token_expiry = time.time() - self.clock_skew + int(
+            response.get('expires_in', self.access_token_lifetime_sec))
 
         # The Refresh Token
         self.__refresh_token = response.get(
             'refresh_token', self.__refresh_token)
 
-        if self.__access_token:
-            self.logger.info('Authenticated to Reddit as {}'.format(self.user))
-            return True
-
-        self.logger.warning(
-            'Failed to authenticate to Reddit as {}'.format(self.user))
-
-        # Mark our failure
-        return False
+        self.logger.info('Authenticated to Reddit as {}'.format(self.user))
+        return True
 
     def send(self, body, title='', notify_type=NotifyType.INFO, **kwargs):
         """
@@ -442,40 +475,46 @@ class NotifyReddit(NotifyBase):
         # error tracking (used for function return)
         has_error = False
 
-        if not self.__access_token and not self.login():
-            # We failed to authenticate - we're done
-            return False
-
-        if not len(self.subreddits):
-            # We have nothing to notify; we're done
-            self.logger.warning('There are no Reddit targets to notify')
-            return False
-
-        # Prepare our Message Type/Kind
-        if self.kind == RedditMessageKind.AUTO:
-            parsed = NotifyBase.parse_url(body)
-            # Detect a link
-            if parsed and parsed.get('schema', '').startswith('http') \
-                    and parsed.get('host'):
-                kind = RedditMessageKind.LINK
-
+        if self.__access_token and time.time() >= self.__access_token_expiry:
+            # Our token has expired; there is no point in sending our
+            # notification only to be turned away.  Acquire a new one.
+            self.logger.debug('Reddit access token has expired')
+            self.__access_token = None
+
+        # Re-use our connection (keep-alive) between our authentication and
+        # every subreddit we post to
+        with requests.Session() as session:
+            if not self.__access_token and not self.login(session=session):
+                # We failed to authenticate - we're done
+                return False
+
+            if not len(self.subreddits):
+                # We have nothing to notify; we're done
+                self.logger.warning('There are no Reddit targets to notify')
+                return False
+
+            # Prepare our Message Type/Kind
+            if self.kind == RedditMessageKind.AUTO:
+                # Only a body that starts with an http(s) schema can be a link
+                # so we avoid parsing the body as a URL otherwise
+                parsed = NotifyBase.parse_url(body) \
+                    if body.lstrip()[:4].lower() == 'http' else None
+
+                # Detect a link
+                if parsed and parsed.get('schema', '').startswith('http') \
+                        and parsed.get('host'):
+                    kind = RedditMessageKind.LINK
+
+                else:
+                    kind = RedditMessageKind.SELF
             else:
-                kind = RedditMessageKind.SELF
-        else:
-            kind = self.kind
-
-        # Create a copy of the subreddits list
-        subreddits = list(self.subreddits)
-        while len(subreddits) > 0:
-            # Retrieve our subreddit
-            subreddit = subreddits.pop()
+                kind = self.kind
 
-            # Prepare our payload
-            payload = {
+            # Prepare our payload; only our subreddit changes per submission
+            base_payload = {
                 'ad': True if self.advertisement else False,
                 'api_type': 'json',
                 'extension': 'json',
-                'sr': subreddit,
                 'title': title if title else self.app_desc,
                 'kind': kind,
                 'nsfw': True if self.nsfw else False,
@@ -485,55 +524,56 @@ class NotifyReddit(NotifyBase):
             }
 
             if self.flair_id:
-                payload['flair_id'] = self.flair_id
+                base_payload['flair_id'] = self.flair_id
 
             if self.flair_text:
-                payload['flair_text'] = self.flair_text
+                base_payload['flair_text'] = self.flair_text
 
             if kind == RedditMessageKind.LINK:
-                payload.update({
+                base_payload.update({
                     'url': body,
                 })
             else:
-                payload.update({
+                base_payload.update({
                     'text': body,
                 })
 
-            postokay, response = self._fetch(self.submit_url, payload=payload)
-            # only toggle has_error flag if we had an error
-            if not postokay:
-                # Mark our failure
-                has_error = True
-                continue
+            for subreddit in self.subreddits:
+                payload = dict(base_payload, sr=subreddit)
 
-            # If we reach here, we were successful
-            self.logger.info(
-                'Sent Reddit notification to {}'.format(
-                    subreddit))
+                postokay, response = self._fetch(
+                    self.submit_url, payload=payload, session=session)
+                # only toggle has_error flag if we had an error
+                if not postokay:
+                    # Mark our failure
+                    has_error = True
+                    continue
 
-        return not has_error
+                # If we reach here, we were successful
+                self.logger.info(
+                    'Sent Reddit notification to {}'.format(
+                        subreddit))
 
-    def _fetch(self, url, payload=None):
+            return not has_error
+
+    def _fetch(self, url, payload=None, session=None):
         """
         Wrapper to Reddit API requests object
         """
 
-        # use what was specified, otherwise build headers dynamically
-        headers = {
-            'User-Agent': '{} v{}'.format(__title__, __version__)
-        }
-
-        if self.__access_token:
-            # Set our token
-            headers['Authorization'] = 'Bearer {}'.format(self.__access_token)
+        if session is None:
+            # Open a connection for this request alone
+            with requests.Session() as session:
+                return self._fetch(url, payload=payload, session=session)
 
         # Prepare our url
         url = self.submit_url if self.__access_token else self.auth_url
 
         # Some Debug Logging
-        self.logger.debug('Reddit POST URL: {} (cert_verify={})'.format(
-            url, self.verify_certificate))
-        self.logger.debug('Reddit Payload: %s' % str(payload))
+        self.logger.debug(
+            'Reddit POST URL: %s (cert_verify=%r)',
+            url, self.verify_certificate)
+        self.logger.debug('Reddit Payload: %s', payload)
 
         # By default set wait to None
         wait = None
@@ -545,12 +585,10 @@ class NotifyReddit(NotifyBase):
             # Reddit server.  One would hope we're on NTP and our clocks are
             # the same allowing this to role smoothly:
 
-            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            now = time.time()
             if now < self.ratelimit_reset:
                 # We need to throttle for the difference in seconds
-                wait = abs(
-                    (self.ratelimit_reset - now + self.clock_skew)
-                    .total_seconds())
+                wait = self.ratelimit_reset - now + self.clock_skew
 
         # Always call throttle before any remote server i/o is made;
         self.throttle(wait=wait)
@@ -560,20 +598,22 @@ class NotifyReddit(NotifyBase):
 
         # acquire our request mode
         try:
-            r = requests.post(
-                url,
-                data=payload,
-                auth=None if self.__access_token
-                else (self.client_id, self.client_secret),
-                headers=headers,
-                verify=self.verify_certificate,
-                timeout=self.request_timeout,
-            )
+            # We attempt to login again and retry the original request (once)
+            # if we aren't in the process of handling a login already
+            for retry in (False, True):
+                r = session.post(
+                    url,
+                    data=payload,
+                    auth=None if self.__access_token else self._basic_auth,
+                    headers=self._bearer_headers if self.__access_token
+                    else self._base_headers,
+                    verify=self.verify_certificate,
+                    timeout=self.request_timeout,
+                )
 
-            #  We attempt to login again and retry the original request
-            #  if we aren't in the process of handling a login already
-            if r.status_code != requests.codes.ok \
-                    and self.__access_token and url != self.auth_url:
+                if retry or r.status_code == requests.codes.ok \
+                        or not self.__access_token or url == self.auth_url:
+                    break
 
                 # We had a problem
                 status_str = \
@@ -582,36 +622,25 @@ class NotifyReddit(NotifyBase):
 
                 self.logger.debug(
                     'Taking countermeasures after failed to send to Reddit '
-                    '{}: {}error={}'.format(
-                        url,
-                        ', ' if status_str else '',
-                        r.status_code))
+                    '%s: %s%serror=%s', url, status_str,
+                    ', ' if status_str else '', r.status_code)
 
                 self.logger.debug(
-                    'Response Details:\r\n{}'.format(r.content))
+                    'Response Details:\r\n%s', r.content)
 
                 # We failed to authenticate with our token; login one more
                 # time and retry this original request
-                if not self.login():
+                if not self.login(session=session):
                     return (False, {})
 
-                # Try again
-                r = requests.post(
-                    url,
-                    data=payload,
-                    headers=headers,
-                    verify=self.verify_certificate,
-                    timeout=self.request_timeout
-                )
-
-            # Get our JSON content if it's possible
+            # Get our JSON content if it's possible; an empty body (such as
+            # one returned with some errors) has nothing to parse
             try:
-                content = loads(r.content)
+                content = loads(r.content) if r.content else {}
 
-            except (TypeError, ValueError, AttributeError):
+            except (TypeError, ValueError):
                 # TypeError = r.content is not a String
                 # ValueError = r.content is Unparsable
-                # AttributeError = r.content is None
 
                 # We had a problem
                 status_str = \
@@ -621,13 +650,14 @@ class NotifyReddit(NotifyBase):
                 # Reddit always returns a JSON response
                 self.logger.warning(
                     'Failed to send to Reddit after countermeasures {}: '
-                    '{}error={}'.format(
+                    '{}{}error={}'.format(
                         url,
+                        status_str,
                         ', ' if status_str else '',
                         r.status_code))
 
                 self.logger.debug(
-                    'Response Details:\r\n{}'.format(r.content))
+                    'Response Details:\r\n%s', r.content)
                 return (False, {})
 
             if r.status_code != requests.codes.ok:
@@ -638,13 +668,14 @@ class NotifyReddit(NotifyBase):
 
                 self.logger.warning(
                     'Failed to send to Reddit {}: '
-                    '{}error={}'.format(
+                    '{}{}error={}'.format(
                         url,
+                        status_str,
                         ', ' if status_str else '',
                         r.status_code))
 
                 self.logger.debug(
-                    'Response Details:\r\n{}'.format(r.content))
+                    'Response Details:\r\n%s', r.content)
 
                 # Mark our failure
                 return (False, content)
@@ -659,19 +690,25 @@ class NotifyReddit(NotifyBase):
                         str(errors)))
 
                 self.logger.debug(
-                    'Response Details:\r\n{}'.format(r.content))
+                    'Response Details:\r\n%s', r.content)
 
                 # Mark our failure
                 return (False, content)
 
+            # Store our rate limiting (if provided); each header is handled
+            # on its own so that one bad value does not discard the other
             try:
-                # Store our rate limiting (if provided)
                 self.ratelimit_remaining = \
-                    float(r.headers.get(
-                        'X-RateLimit-Remaining'))
-                self.ratelimit_reset = datetime.fromtimestamp(
-                    int(r.headers.get('X-RateLimit-Reset')), timezone.utc
-                ).replace(tzinfo=None)
+                    float(r.headers.get('X-RateLimit-Remaining'))
+
+            except (TypeError, ValueError):
+                # This is returned if we could not retrieve this information
+                # gracefully accept this state and move on
+                pass
+
+            try:
+                self.ratelimit_reset = \
+                    float(r.headers.get('X-RateLimit-Reset'))
 
             except (TypeError, ValueError):
                 # This is returned if we could not retrieve this information
@@ -682,7 +719,7 @@ class NotifyReddit(NotifyBase):
             self.logger.warning(
                 'Exception received when sending Reddit to {}'.
                 format(url))
-            self.logger.debug('Socket Exception: %s' % str(e))
+            self.logger.debug('Socket Exception: %s', str(e))
 
             # Mark our failure
             return (False, content)
@@ -711,33 +748,18 @@ class NotifyReddit(NotifyBase):
         else:
             results['kind'] = RedditMessageKind.AUTO
 
-        # Is an Ad?
-        results['ad'] = \
-            parse_bool(results['qsd'].get('ad', False))
-
-        # Get Not Safe For Work (NSFW) Flag
-        results['nsfw'] = \
-            parse_bool(results['qsd'].get('nsfw', False))
-
-        # Send Replies Flag
-        results['replies'] = \
-            parse_bool(results['qsd'].get('replies', True))
-
-        # Resubmit Flag
-        results['resubmit'] = \
-            parse_bool(results['qsd'].get('resubmit', False))
-
-        # Is Spoiler Flag
-        results['spoiler'] = \
-            parse_bool(results['qsd'].get('spoiler', False))
-
-        if 'flair_text' in results['qsd']:
-            results['flair_text'] = \
-                NotifyReddit.unquote(results['qsd']['flair_text'])
-
-        if 'flair_id' in results['qsd']:
-            results['flair_id'] = \
-                NotifyReddit.unquote(results['qsd']['flair_id'])
+        # Our boolean flags (Is an Ad?, Not Safe For Work (NSFW), Send
+        # Replies, Resubmit and Is Spoiler) are all described by our
+        # template arguments
+        for key in ('ad', 'nsfw', 'replies', 'resubmit', 'spoiler'):
+            arg = NotifyReddit.template_args[key]
+            results[arg['map_to']] = \
+                parse_bool(results['qsd'].get(key, arg['default']))
+
+        # Flair settings
+        for key in ('flair_text', 'flair_id'):
+            if key in results['qsd']:
+                results[key] = NotifyReddit.unquote(results['qsd'][key])
 
         # The 'to' makes it easier to use yaml configuration
         if 'to' in results['qsd'] and len(results['qsd']['to']):
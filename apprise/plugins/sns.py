@@ -32,7 +32,6 @@ import requests
 from hashlib import sha256
 from datetime import datetime
 from datetime import timezone
-from collections import OrderedDict
 from xml.etree import ElementTree
 from itertools import chain
 
@@ -53,14 +52,15 @@ from ..locale import gettext_lazy as _
 #
 # Allow a starting hashtag (#) specification to help eliminate possible
 # ambiguity between a topic that is comprised of all digits and a phone number
-IS_TOPIC = re.compile(r'^#?(?P<name>[A-Za-z0-9_-]+)\s*$')
+IS_TOPIC = re.compile(r'^#?(?P<name>[A-Za-z0-9_-]+)\s*$', re.ASCII)
 
 # Because our AWS Access Key Secret contains slashes, we actually use the
 # region as a delimiter. This is a bit hacky; but it's much easier than having
 # users of this product search though this Access Key Secret and escape all
 # of the forward slashes!
 IS_REGION = re.compile(
-    r'^\s*(?P<country>[a-z]{2})-(?P<area>[a-z-]+?)-(?P<no>[0-9]+)\s*$', re.I)
+    r'^\s*(?P<country>[a-z]{2})-(?P<area>[a-z-]+?)-(?P<no>[0-9]+)\s*$',
+    re.I | re.ASCII)
 
 # Extend HTTP Error Messages
 AWS_HTTP_ERROR_MAP = {
@@ -68,6 +68,64 @@ AWS_HTTP_ERROR_MAP = {
 }
 
 
+def aws_sign(key, msg, to_hex=False):
+    """
+    Perform AWS Signing
+    """
+    if to_hex:
+        return hmac.new(key, msg.encode('utf-8'), sha256).hexdigest()
+    return hmac.new(key, msg.encode('utf-8'), sha256).digest()
+
+
+class AWSResponseTarget:
+    """
+    An ElementTree parser target that collects the text of the leaf
+    elements found in an AWS response without building a tree out of it.
+
+    Tags are compared without their namespace (if one is present).
+    """
+
+    def __init__(self, keep_map):
+        """
+        Initialize our target with a mapping of the tags we want to keep
+        to the key they should be stored as
+        """
+        self.keep_map = keep_map
+
+        # The tag of our root element
+        self.root = None
+
+        # Our extracted content
+        self.response = {}
+
+        # The text of the element we're in and whether it is a leaf
+        self.text = []
+        self.leaf = False
+
+    def start(self, tag, attrib):
+        tag = tag.rpartition('}')[2]
+        if self.root is None:
+            self.root = tag
+
+        self.leaf = True
+        self.text = []
+
+    def data(self, data):
+        if self.leaf:
+            self.text.append(data)
+
+    def end(self, tag):
+        tag = tag.rpartition('}')[2]
+        if self.leaf and tag in self.keep_map:
+            self.response[self.keep_map[tag]] = ''.join(self.text).strip()
+
+        # Our parent (if we have one) is not a leaf
+        self.leaf = False
+
+    def close(self):
+        return self.root, self.response
+
+
 class NotifySNS(NotifyBase):
     """
     A wrapper for AWS SNS (Amazon Simple Notification)
@@ -198,6 +256,9 @@ class NotifySNS(NotifyBase):
         # Initialize numbers list
         self.phone = list()
 
+        # Our topic name to Amazon Resource Name (ARN) mapping
+        self._topic_arns = {}
+
         # Set our notify_url based on our region
         self.notify_url = 'https://sns.{}.amazonaws.com/'\
             .format(self.aws_region_name)
@@ -211,9 +272,26 @@ class NotifySNS(NotifyBase):
         self.aws_auth_algorithm = 'AWS4-HMAC-SHA256'
         self.aws_auth_request = 'aws4_request'
 
+        # The host we sign against and our credential scope (less the date)
+        # never change for the lifetime of this object
+        self.aws_host = '{service}.{region}.amazonaws.com'.format(
+            service=self.aws_service_name,
+            region=self.aws_region_name)
+        self.aws_scope = '{region}/{service}/{request}'.format(
+            region=self.aws_region_name,
+            service=self.aws_service_name,
+            request=self.aws_auth_request,
+        )
+
+        # A (date, key) tuple of our derived signing key
+        self._aws_signing_key = None
+
         # Validate targets and drop bad ones:
         for target in parse_list(targets):
-            result = is_phone_no(target)
+            # A target starting with a hashtag or a letter can only be a
+            # topic; don't bother checking it as a phone number
+            result = None if target[0] == '#' or target[0].isalpha() \
+                else is_phone_no(target)
             if result:
                 # store valid phone number in E.164 format
                 self.phone.append('+{}'.format(result['full']))
@@ -226,9 +304,7 @@ class NotifySNS(NotifyBase):
                 continue
 
             self.logger.warning(
-                'Dropped invalid phone/topic '
-                '(%s) specified.' % target,
-            )
+                'Dropped invalid phone/topic (%s) specified.', target)
 
         return
 
@@ -249,68 +325,85 @@ class NotifySNS(NotifyBase):
         phone = list(self.phone)
         topics = list(self.topics)
 
-        while len(phone) > 0:
-
-            # Get Phone No
-            no = phone.pop(0)
-
-            # Prepare SNS Message Payload
-            payload = {
-                'Action': u'Publish',
-                'Message': body,
-                'Version': u'2010-03-31',
-                'PhoneNumber': no,
-            }
-
-            (result, _) = self._post(payload=payload, to=no)
-            if not result:
-                error_count += 1
-
-        # Send all our defined topic id's
-        while len(topics):
-
-            # Get Topic
-            topic = topics.pop(0)
-
-            # First ensure our topic exists, if it doesn't, it gets created
-            payload = {
-                'Action': u'CreateTopic',
-                'Version': u'2010-03-31',
-                'Name': topic,
-            }
-
-            (result, response) = self._post(payload=payload, to=topic)
-            if not result:
-                error_count += 1
-                continue
-
-            # Get the Amazon Resource Name
-            topic_arn = response.get('topic_arn')
-            if not topic_arn:
-                # Could not acquire our topic; we're done
-                error_count += 1
-                continue
-
-            # Build our payload now that we know our topic_arn
-            payload = {
-                'Action': u'Publish',
-                'Version': u'2010-03-31',
-                'TopicArn': topic_arn,
-                'Message': body,
-            }
-
-            # Send our payload to AWS
-            (result, _) = self._post(payload=payload, to=topic)
-            if not result:
-                error_count += 1
+        # Re-use our connection (keep-alive) between every post we make
+        with requests.Session() as session:
+            while len(phone) > 0:
+
+                # Get Phone No
+                no = phone.pop(0)
+
+                # Prepare SNS Message Payload
+                payload = {
+                    'Action': u'Publish',
+                    'Message': body,
+                    'Version': u'2010-03-31',
+                    'PhoneNumber': no,
+                }
+
+                (result, _) = self._post(
+                    payload=payload, to=no, session=session)
+                if not result:
+                    error_count += 1
+
+            # Send all our defined topic id's
+            while len(topics):
+
+                # Get Topic
+                topic = topics.pop(0)
+
+                # Use the Amazon Resource Name we resolved previously (if any)
+                topic_arn = self._topic_arns.get(topic)
+                if not topic_arn:
+                    # First ensure our topic exists, if it doesn't, it gets
+                    # created
+                    payload = {
+                        'Action': u'CreateTopic',
+                        'Version': u'2010-03-31',
+                        'Name': topic,
+                    }
+
+                    (result, response) = self._post(
+                        payload=payload, to=topic, session=session)
+                    if not result:
+                        error_count += 1
+                        continue
+
+                    # Get the Amazon Resource Name
+                    topic_arn = response.get('topic_arn')
+                    if not topic_arn:
+                        # Could not acquire our topic; we're done
+                        error_count += 1
+                        continue
+
+                    # Store our Amazon Resource Name for future notifications
+                    self._topic_arns[topic] = topic_arn
+
+                # Build our payload now that we know our topic_arn
+                payload = {
+                    'Action': u'Publish',
+                    'Version': u'2010-03-31',
+                    'TopicArn': topic_arn,
+                    'Message': body,
+                }
+
+                # Send our payload to AWS
+                (result, _) = self._post(
+                    payload=payload, to=topic, session=session)
+                if not result:
+                    # Our topic may no longer exist (or is no longer ours); it
+                    # will be looked up again next time
+                    self._topic_arns.pop(topic, None)
+                    error_count += 1
 
         return error_count == 0
 
-    def _post(self, payload, to):
+    def _post(self, payload, to, session):
         """
         Wrapper to request.post() to manage it's response better and make
         the send() function cleaner and easier to maintain.
 
+        Our request is made using the open requests.Session provided.
+
         This function returns True if the _post was successful and False
         if it wasn't.
         """
@@ -329,13 +422,13 @@ class NotifySNS(NotifyBase):
         # Prepare our AWS Headers based on our payload
         headers = self.aws_prepare_request(payload)
 
-        self.logger.debug('AWS POST URL: %s (cert_verify=%r)' % (
-            self.notify_url, self.verify_certificate,
-        ))
-        self.logger.debug('AWS Payload: %s' % str(payload))
+        self.logger.debug(
+            'AWS POST URL: %s (cert_verify=%r)',
+            self.notify_url, self.verify_certificate)
+        self.logger.debug('AWS Payload: %s', payload)
 
         try:
-            r = requests.post(
+            r = session.post(
                 self.notify_url,
                 data=payload,
                 headers=headers,
@@ -357,20 +450,18 @@ class NotifySNS(NotifyBase):
                         ', ' if status_str else '',
                         r.status_code))
 
-                self.logger.debug('Response Details:\r\n{}'.format(r.content))
+                self.logger.debug('Response Details:\r\n%s', r.content)
 
                 return (False, NotifySNS.aws_response_to_dict(r.text))
 
             else:
-                self.logger.info(
-                    'Sent AWS notification to "%s".' % (to))
+                self.logger.info('Sent AWS notification to "%s".', to)
 
         except requests.RequestException as e:
             self.logger.warning(
                 'A Connection error occurred sending AWS '
-                'notification to "%s".' % (to),
-            )
-            self.logger.debug('Socket Exception: %s' % str(e))
+                'notification to "%s".', to)
+            self.logger.debug('Socket Exception: %s', str(e))
             return (False, NotifySNS.aws_response_to_dict(None))
 
         return (True, NotifySNS.aws_response_to_dict(r.text))
@@ -405,21 +496,23 @@ class NotifySNS(NotifyBase):
         headers['X-Amz-Date'] = amzdate
 
         # Credential Scope
-        scope = '{date}/{region}/{service}/{request}'.format(
+        scope = '{date}/{scope}'.format(
             date=reference.strftime('%Y%m%d'),
-            region=self.aws_region_name,
-            service=self.aws_service_name,
-            request=self.aws_auth_request,
+            scope=self.aws_scope,
         )
 
-        # Similar to headers; but a subset.  keys must be lowercase
-        signed_headers = OrderedDict([
-            ('content-type', headers['Content-Type']),
-            ('host', '{service}.{region}.amazonaws.com'.format(
-                service=self.aws_service_name,
-                region=self.aws_region_name)),
-            ('x-amz-date', headers['X-Amz-Date']),
-        ])
+        # Similar to headers; but a subset.  keys must be lowercase and
+        # each entry must end with a newline
+        signed_headers = \
+            'content-type:{content_type}\nhost:{host}\n' \
+            'x-amz-date:{amzdate}\n'.format(
+                content_type=headers['Content-Type'],
+                host=self.aws_host,
+                amzdate=amzdate,
+            )
+
+        # Header Entries (in same order identified above)
+        signed_header_keys = 'content-type;host;x-amz-date'
 
         #
         # Build Canonical Request Object
@@ -437,11 +530,10 @@ class NotifySNS(NotifyBase):
             # Header Content (must include \n at end!)
             # All entries except characters in amazon date must be
             # lowercase
-            '\n'.join(['%s:%s' % (k, v)
-                      for k, v in signed_headers.items()]) + '\n',
+            signed_headers,
 
-            # Header Entries (in same order identified above)
-            ';'.join(signed_headers.keys()),
+            # Header Entries
+            signed_header_keys,
 
             # Payload
             sha256(payload.encode('utf-8')).hexdigest(),
@@ -463,7 +555,7 @@ class NotifySNS(NotifyBase):
                 scope=scope,
             ),
             'SignedHeaders={signed_headers}'.format(
-                signed_headers=';'.join(signed_headers.keys()),
+                signed_headers=signed_header_keys,
             ),
             'Signature={signature}'.format(
                 signature=self.aws_auth_signature(to_sign, reference)
@@ -478,23 +570,20 @@ class NotifySNS(NotifyBase):
         which should be in the form of a string.
         """
 
-        def _sign(key, msg, to_hex=False):
-            """
-            Perform AWS Signing
-            """
-            if to_hex:
-                return hmac.new(key, msg.encode('utf-8'), sha256).hexdigest()
-            return hmac.new(key, msg.encode('utf-8'), sha256).digest()
+        # Our signing key only depends on the date (along with our static
+        # credentials, region and service) so it is only derived once a day
+        date = reference.strftime('%Y%m%d')
+        if not self._aws_signing_key or self._aws_signing_key[0] != date:
+            _date = aws_sign((
+                self.aws_auth_version +
+                self.aws_secret_access_key).encode('utf-8'), date)
 
-        _date = _sign((
-            self.aws_auth_version +
-            self.aws_secret_access_key).encode('utf-8'),
-            reference.strftime('%Y%m%d'))
+            _region = aws_sign(_date, self.aws_region_name)
+            _service = aws_sign(_region, self.aws_service_name)
+            _signed = aws_sign(_service, self.aws_auth_request)
+            self._aws_signing_key = (date, _signed)
 
-        _region = _sign(_date, self.aws_region_name)
-        _service = _sign(_region, self.aws_service_name)
-        _signed = _sign(_service, self.aws_auth_request)
-        return _sign(_signed, to_sign, to_hex=True)
+        return aws_sign(self._aws_signing_key[1], to_sign, to_hex=True)
 
     @staticmethod
     def aws_response_to_dict(aws_response):
@@ -544,28 +633,16 @@ class NotifySNS(NotifyBase):
         }
 
         try:
-            # we build our tree, but not before first eliminating any
-            # reference to namespacing (if present) as it makes parsing
-            # the tree so much easier.
-            root = ElementTree.fromstring(
-                re.sub(' xmlns="[^"]+"', '', aws_response, count=1))
+            # We feed our response through a parser target that picks out
+            # the fields we're interested in (ignoring any namespacing) in
+            # efforts to populate our response object.
+            parser = ElementTree.XMLParser(
+                target=AWSResponseTarget(aws_keep_map))
+            parser.feed(aws_response)
 
             # Store our response tag object name
-            response['type'] = str(root.tag)
-
-            def _xml_iter(root, response):
-                if len(root) > 0:
-                    for child in root:
-                        # use recursion to parse everything
-                        _xml_iter(child, response)
-
-                elif root.tag in aws_keep_map.keys():
-                    response[aws_keep_map[root.tag]] = (root.text).strip()
-
-            # Recursivly iterate over our AWS Response to extract the
-            # fields we're interested in in efforts to populate our response
-            # object.
-            _xml_iter(root, response)
+            response['type'], content = parser.close()
+            response.update(content)
 
         except (ElementTree.ParseError, TypeError):
             # bad data just causes us to generate a bad response
@@ -207,6 +207,23 @@ VALID_PYTHON_FILE_RE = re.compile(r'.+\.py(o|c)?$', re.IGNORECASE)
 # regular expressions
 REGEX_VALIDATE_LOOKUP = {}
 
+# validate_regex() utilizes this mapping to convert a string of regular
+# expression flags into their respected integer (expected) Python values
+REGEX_FLAG_LOOKUP = {
+    # Ignore Case
+    'i': re.I,
+    # Multi Line
+    'm': re.M,
+    # Dot Matches All
+    's': re.S,
+    # Locale Dependant
+    'L': re.L,
+    # Unicode Matching
+    'u': re.U,
+    # Verbose
+    'x': re.X,
+}
+
 
 class Singleton(type):
     """
@@ -502,22 +519,24 @@ def is_email(address):
         return False
 
     if match:
+        # Acquire all of our groups in one call
+        groups = match.groupdict()
         return {
             # The name parsed from the URL (if one exists)
-            'name': '' if match.group('name') is None
-            else match.group('name').strip(),
+            'name': '' if groups['name'] is None
+            else groups['name'].strip(),
             # The email address
-            'email': match.group('email'),
+            'email': groups['email'],
             # The full email address (includes label if specified)
-            'full_email': match.group('full_email'),
+            'full_email': groups['full_email'],
             # The label (if specified) e.g: label+user@example.com
-            'label': '' if match.group('label') is None
-            else match.group('label').strip(),
+            'label': '' if groups['label'] is None
+            else groups['label'].strip(),
             # The user (which does not include the label) from the email
             # parsed.
-            'user': match.group('userid'),
+            'user': groups['userid'],
             # The domain associated with the email address
-            'domain': match.group('domain'),
+            'domain': groups['domain'],
         }
 
     return False
@@ -1273,44 +1292,31 @@ def validate_regex(value, regex=r'[^\s]+', flags=re.I, strip=True, fmt=None):
         would substitute the matched groups and format a response.
     """
 
-    if flags:
-        # Regex String -> Flag Lookup Map
-        _map = {
-            # Ignore Case
-            'i': re.I,
-            # Multi Line
-            'm': re.M,
-            # Dot Matches All
-            's': re.S,
-            # Locale Dependant
-            'L': re.L,
-            # Unicode Matching
-            'u': re.U,
-            # Verbose
-            'x': re.X,
-        }
-
-        if isinstance(flags, str):
-            # Convert a string of regular expression flags into their
-            # respected integer (expected) Python values and perform
-            # a bit-wise or on each match found:
-            flags = reduce(
-                lambda x, y: x | y,
-                [0] + [_map[f] for f in flags if f in _map])
-
-    else:
+    if not flags:
         # Handles None/False/'' cases
         flags = 0
 
+    elif isinstance(flags, str):
+        # Convert a string of regular expression flags into their
+        # respected integer (expected) Python values and perform
+        # a bit-wise or on each match found:
+        flags = reduce(
+            lambda x, y: x | y,
+            [0] + [REGEX_FLAG_LOOKUP[f] for f in flags
+                   if f in REGEX_FLAG_LOOKUP])
+
     # A key is used to store our compiled regular expression
-    key = '{}{}'.format(regex, flags)
+    key = (regex, flags)
+
+    try:
+        compiled = REGEX_VALIDATE_LOOKUP[key]
 
-    if key not in REGEX_VALIDATE_LOOKUP:
-        REGEX_VALIDATE_LOOKUP[key] = re.compile(regex, flags)
+    except KeyError:
+        compiled = REGEX_VALIDATE_LOOKUP[key] = re.compile(regex, flags)
 
     # Perform our lookup usig our pre-compiled result
     try:
-        result = REGEX_VALIDATE_LOOKUP[key].match(value)
+        result = compiled.match(value)
         if not result:
             # let outer exception handle this
             raise TypeError
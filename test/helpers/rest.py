@@ -279,12 +279,14 @@ class AppriseURLTester:
     @mock.patch('requests.delete')
     @mock.patch('requests.patch')
     @mock.patch('requests.request')
+    @mock.patch('requests.Session.post')
     def __notify(
         self,
         url,
         obj,
         meta,
         asset,
+        mock_session_post,
         mock_request,
         mock_patch,
         mock_del,
@@ -359,6 +361,9 @@ class AppriseURLTester:
         mock_put.return_value = robj
         mock_request.return_value = robj
 
+        # Posts made through a requests.Session() share our post() mock
+        mock_session_post.side_effect = mock_post
+
         if test_requests_exceptions is False:
             # Handle our default response
             mock_put.return_value.status_code = requests_response_code
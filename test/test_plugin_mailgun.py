@@ -29,6 +29,7 @@
 import os
 from unittest import mock
 
+import pytest
 import requests
 
 from apprise.plugins.mailgun import NotifyMailgun
@@ -191,7 +192,7 @@ def test_plugin_mailgun_urls():
     AppriseURLTester(tests=apprise_url_tests).run_all()
 
 
-@mock.patch('requests.post')
+@mock.patch('requests.Session.post')
 def test_plugin_mailgun_attachments(mock_post):
     """
     NotifyMailgun() Attachments
@@ -252,31 +253,31 @@ def test_plugin_mailgun_attachments(mock_post):
     # Do it again, but fail on the third file
     with mock.patch(
             'builtins.open',
-            side_effect=(mock.Mock(), mock.Mock(), OSError())):
+            side_effect=(mock.MagicMock(), mock.MagicMock(), OSError())):
 
         assert obj.notify(
             body='body', title='title', notify_type=NotifyType.INFO,
             attach=attach) is False
 
     with mock.patch('builtins.open') as mock_open:
-        mock_fp = mock.Mock()
-        mock_fp.seek.side_effect = OSError()
+        mock_fp = mock.MagicMock()
+        mock_fp.__enter__.return_value = mock_fp
+        mock_fp.read.side_effect = OSError()
         mock_open.return_value = mock_fp
 
-        # We can't send the message we can't seek through it
+        # We can't send the message we can't read it
         assert obj.notify(
             body='body', title='title', notify_type=NotifyType.INFO,
             attach=attach) is False
 
         mock_post.reset_mock()
-        # Fail on the third file; this tests the for-loop inside the seek()
-        # section of the code that calls close() on previously opened files
-        mock_fp.seek.side_effect = (None, None, OSError())
-        mock_open.return_value = mock_fp
-        # We can't send the message we can't seek through it
+        # Fail on the third file
+        mock_fp.read.side_effect = (b'a', b'b', OSError())
+        # We can't send the message we can't read it
         assert obj.notify(
             body='body', title='title', notify_type=NotifyType.INFO,
             attach=attach) is False
+        assert mock_post.call_count == 0
 
     # test the handling of our batch modes
     obj = Apprise.instantiate(
@@ -295,10 +296,22 @@ def test_plugin_mailgun_attachments(mock_post):
 
     mock_post.reset_mock()
 
-    assert obj.notify(
-        body='body', title='title', notify_type=NotifyType.INFO,
-        attach=attach) is True
-    assert mock_post.call_count == 2
+    with mock.patch('builtins.open', wraps=open) as mock_open:
+        assert obj.notify(
+            body='body', title='title', notify_type=NotifyType.INFO,
+            attach=attach) is True
+        assert mock_post.call_count == 2
+
+        # Each attachment is only read once regardless of our batch count
+        assert mock_open.call_count == 3
+
+        # Both of our posts carried the same attachment content
+        files = mock_post.call_args_list[0][1]['files']
+        assert len(files) == 3
+        assert mock_post.call_args_list[1][1]['files'] == files
+        for name, content in files.values():
+            assert name == 'apprise-test.gif'
+            assert isinstance(content, bytes)
 
     # single batch
     mock_post.reset_mock()
@@ -311,7 +324,7 @@ def test_plugin_mailgun_attachments(mock_post):
     assert mock_post.call_count == 1
 
 
-@mock.patch('requests.post')
+@mock.patch('requests.Session.post')
 def test_plugin_mailgun_header_check(mock_post):
     """
     NotifyMailgun() Test Header Prep
@@ -419,3 +432,152 @@ def test_plugin_mailgun_header_check(mock_post):
     assert 'to' in payload
     assert 'luke@rebels.com' == payload['from']
     assert 'luke@rebels.com' == payload['to']
+
+
+@mock.patch('requests.Session.post')
+def test_plugin_mailgun_cc_bcc(mock_post):
+    """
+    NotifyMailgun() Carbon Copy and Blind Carbon Copy handling
+
+    """
+
+    okay_response = requests.Request()
+    okay_response.status_code = requests.codes.ok
+    okay_response.content = ""
+
+    # Track a copy of each payload we post
+    payloads = []
+
+    def _post(url, data, **kwargs):
+        payloads.append(dict(data))
+        return okay_response
+
+    mock_post.side_effect = _post
+
+    # API Key
+    apikey = 'abc123'
+
+    obj = Apprise.instantiate(
+        'mailgun://user@localhost.localdomain/{}/'
+        'user1@example.com/user2@example.com?'
+        'cc=Jack:user1@example.com,Jill:user3@example.com&'
+        'bcc=user2@example.com,user3@example.com,user4@example.com'.format(
+            apikey))
+    assert isinstance(obj, NotifyMailgun)
+
+    # Send our notification; one post per target
+    assert obj.notify(
+        body='body', title='title', notify_type=NotifyType.INFO) is True
+    assert mock_post.call_count == 2
+
+    # Our first target is stripped from our Carbon Copy list; our remaining
+    # cc is also a bcc which takes priority
+    payload = payloads[0]
+    assert payload['to'] == 'user1@example.com'
+    assert 'cc' not in payload
+    assert sorted(payload['bcc'].split(',')) == [
+        'user2@example.com', 'user3@example.com', 'user4@example.com']
+
+    # Our second target is stripped from our Blind Carbon Copy list
+    payload = payloads[1]
+    assert payload['to'] == 'user2@example.com'
+    assert payload['cc'] == 'Jack <user1@example.com>'
+    assert sorted(payload['bcc'].split(',')) == [
+        'user3@example.com', 'user4@example.com']
+
+    mock_post.reset_mock()
+    del payloads[:]
+
+    obj = Apprise.instantiate(
+        'mailgun://user@localhost.localdomain/{}/'
+        'user1@example.com/user2@example.com?batch=yes&'
+        'cc=Jack:user1@example.com,Jill:user3@example.com&'
+        'bcc=user4@example.com'.format(apikey))
+    assert isinstance(obj, NotifyMailgun)
+
+    # Send our notification; all targets are combined into a single post
+    assert obj.notify(
+        body='body', title='title', notify_type=NotifyType.INFO) is True
+    assert mock_post.call_count == 1
+
+    payload = payloads[0]
+    assert payload['to'] == 'user1@example.com,user2@example.com'
+    assert payload['cc'] == 'Jill <user3@example.com>'
+    assert payload['bcc'] == 'user4@example.com'
+
+    mock_post.reset_mock()
+    del payloads[:]
+
+    obj = Apprise.instantiate(
+        'mailgun://user@localhost.localdomain/{}/'
+        'user1@example.com/user2@example.com?'
+        'cc=user2@example.com&bcc=user1@example.com&'
+        '+X-Customer-Campaign-ID=Apprise&:name=Chris'.format(apikey))
+    assert isinstance(obj, NotifyMailgun)
+
+    assert obj.notify(
+        body='body', title='title', notify_type=NotifyType.INFO) is True
+    assert mock_post.call_count == 2
+
+    # Our headers and tokens are present in every batch
+    for payload in payloads:
+        assert payload['h:X-Customer-Campaign-ID'] == 'Apprise'
+        assert payload['v:name'] == 'Chris'
+
+    # Our cc/bcc entries do not leak from one batch into the next
+    assert payloads[0]['to'] == 'user1@example.com'
+    assert payloads[0]['cc'] == 'user2@example.com'
+    assert 'bcc' not in payloads[0]
+
+    assert payloads[1]['to'] == 'user2@example.com'
+    assert 'cc' not in payloads[1]
+    assert payloads[1]['bcc'] == 'user1@example.com'
+
+
+def test_plugin_mailgun_url_cc_names():
+    """
+    NotifyMailgun() Carbon Copy names survive url() generation
+
+    """
+
+    obj = Apprise.instantiate(
+        'mailgun://user@localhost.localdomain/abc123/user1@example.com?'
+        'cc=Jack:user2@example.com,user3@example.com')
+    assert isinstance(obj, NotifyMailgun)
+    assert obj.names == {
+        'user2@example.com': 'Jack', 'user3@example.com': False}
+
+    # Our generated URL carries our names so we can rebuild the same object
+    obj2 = Apprise.instantiate(obj.url())
+    assert isinstance(obj2, NotifyMailgun)
+    assert obj2.cc == obj.cc
+    assert obj2.names == obj.names
+
+
+def test_plugin_mailgun_region():
+    """
+    NotifyMailgun() Region handling
+
+    """
+
+    # Our region is case insensitive and defaults to the US
+    obj = NotifyMailgun(
+        apikey='abc123', user='user', host='localhost.localdomain',
+        targets=None)
+    assert obj.region_name == 'us'
+    assert obj.notify_url == \
+        'https://api.mailgun.net/v3/localhost.localdomain/messages'
+
+    obj = NotifyMailgun(
+        apikey='abc123', user='user', host='localhost.localdomain',
+        targets=None, region_name='EU')
+    assert obj.region_name == 'eu'
+    assert obj.notify_url == \
+        'https://api.eu.mailgun.net/v3/localhost.localdomain/messages'
+
+    # Invalid regions
+    for region_name in ('invalid', '', 42, object()):
+        with pytest.raises(TypeError):
+            NotifyMailgun(
+                apikey='abc123', user='user', host='localhost.localdomain',
+                targets=None, region_name=region_name)
@@ -26,16 +26,15 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import time
 import requests
+import apprise
 
 from apprise.plugins.reddit import NotifyReddit
 from helpers import AppriseURLTester
 from unittest import mock
 
 from json import dumps
-from datetime import datetime
-from datetime import timedelta
-from datetime import timezone
 
 # Disable logging for a cleaner testing output
 import logging
@@ -229,13 +228,13 @@ def test_plugin_reddit_urls():
     AppriseURLTester(tests=apprise_url_tests).run_all()
 
 
-@mock.patch('requests.post')
+@mock.patch('requests.Session.post')
 def test_plugin_reddit_general(mock_post):
     """
     NotifyReddit() General Tests
 
     """
-    NotifyReddit.clock_skew = timedelta(seconds=0)
+    NotifyReddit.clock_skew = 0
 
     # Generate a valid credentials:
     kwargs = {
@@ -246,9 +245,6 @@ def test_plugin_reddit_general(mock_post):
         'targets': 'apprise',
     }
 
-    # Epoch time:
-    epoch = datetime.fromtimestamp(0, timezone.utc)
-
     good_response = mock.Mock()
     good_response.content = dumps({
         "access_token": 'abc123',
@@ -264,8 +260,7 @@ def test_plugin_reddit_general(mock_post):
     })
     good_response.status_code = requests.codes.ok
     good_response.headers = {
-        'X-RateLimit-Reset': (
-            datetime.now(timezone.utc) - epoch).total_seconds(),
+        'X-RateLimit-Reset': time.time(),
         'X-RateLimit-Remaining': 1,
     }
 
@@ -294,8 +289,7 @@ def test_plugin_reddit_general(mock_post):
 
     # Force a case where there are no more remaining posts allowed
     good_response.headers = {
-        'X-RateLimit-Reset': (
-            datetime.now(timezone.utc) - epoch).total_seconds(),
+        'X-RateLimit-Reset': time.time(),
         'X-RateLimit-Remaining': 0,
     }
     # behind the scenes, it should cause us to update our rate limit
@@ -304,8 +298,7 @@ def test_plugin_reddit_general(mock_post):
 
     # This should cause us to block
     good_response.headers = {
-        'X-RateLimit-Reset': (
-            datetime.now(timezone.utc) - epoch).total_seconds(),
+        'X-RateLimit-Reset': time.time(),
         'X-RateLimit-Remaining': 10,
     }
     assert obj.send(body="test") is True
@@ -319,8 +312,7 @@ def test_plugin_reddit_general(mock_post):
 
     # Reset our variable back to 1
     good_response.headers = {
-        'X-RateLimit-Reset': (
-            datetime.now(timezone.utc) - epoch).total_seconds(),
+        'X-RateLimit-Reset': time.time(),
         'X-RateLimit-Remaining': 1,
     }
     # Handle cases where our epoch time is wrong
@@ -329,8 +321,7 @@ def test_plugin_reddit_general(mock_post):
 
     # Return our object, but place it in the future forcing us to block
     good_response.headers = {
-        'X-RateLimit-Reset': (
-            datetime.now(timezone.utc) - epoch).total_seconds() + 1,
+        'X-RateLimit-Reset': time.time() + 1,
         'X-RateLimit-Remaining': 0,
     }
 
@@ -339,8 +330,7 @@ def test_plugin_reddit_general(mock_post):
 
     # Return our object, but place it in the future forcing us to block
     good_response.headers = {
-        'X-RateLimit-Reset': (
-            datetime.now(timezone.utc) - epoch).total_seconds() - 1,
+        'X-RateLimit-Reset': time.time() - 1,
         'X-RateLimit-Remaining': 0,
     }
     assert obj.send(body="test") is True
@@ -351,8 +341,7 @@ def test_plugin_reddit_general(mock_post):
     # Invalid JSON
     response = mock.Mock()
     response.headers = {
-        'X-RateLimit-Reset': (
-            datetime.now(timezone.utc) - epoch).total_seconds(),
+        'X-RateLimit-Reset': time.time(),
         'X-RateLimit-Remaining': 1,
     }
     response.content = '{'
@@ -397,8 +386,7 @@ def test_plugin_reddit_general(mock_post):
     })
     good_response.status_code = requests.codes.ok
     good_response.headers = {
-        'X-RateLimit-Reset': (
-            datetime.now(timezone.utc) - epoch).total_seconds(),
+        'X-RateLimit-Reset': time.time(),
         'X-RateLimit-Remaining': 1,
     }
 
@@ -420,11 +408,40 @@ def test_plugin_reddit_general(mock_post):
     assert mock_post.call_args_list[3][0][0] == \
         'https://oauth.reddit.com/api/submit'
 
-    # Test failed re-authentication
+    # Our initial login uses our credentials whereas our re-authentication
+    # uses the refresh token we were provided
+    assert mock_post.call_args_list[0][1]['data'] == {
+        'grant_type': 'password',
+        'username': 'user',
+        'password': 'pasword',
+    }
+    assert mock_post.call_args_list[2][1]['data'] == {
+        'grant_type': 'refresh_token',
+        'refresh_token': 'def456',
+    }
+
+    # Test failed re-authentication; our refresh token is rejected and so
+    # are our credentials
+    mock_post.reset_mock()
     mock_post.side_effect = [
-        good_response, bad_response, bad_response]
+        good_response, bad_response, bad_response, bad_response]
     obj = NotifyReddit(**kwargs)
     assert obj.send(body="test") is False
+    assert mock_post.call_count == 4
+    assert mock_post.call_args_list[2][1]['data']['grant_type'] == \
+        'refresh_token'
+    assert mock_post.call_args_list[3][1]['data']['grant_type'] == \
+        'password'
+
+    # Test re-authentication where our refresh token is rejected but our
+    # credentials are still accepted
+    mock_post.reset_mock()
+    mock_post.side_effect = [
+        good_response, bad_response, bad_response, good_response,
+        good_response]
+    obj = NotifyReddit(**kwargs)
+    assert obj.send(body="test") is True
+    assert mock_post.call_count == 5
 
     # Test exception handing on re-auth attempt
     response.content = '{'
@@ -433,3 +450,420 @@ def test_plugin_reddit_general(mock_post):
         good_response, bad_response, good_response, response]
     obj = NotifyReddit(**kwargs)
     assert obj.send(body="test") is False
+
+
+def test_plugin_reddit_targets():
+    """
+    NotifyReddit() Subreddit Parsing
+
+    """
+
+    # A leading hashtag is optional; duplicates are only notified once
+    obj = NotifyReddit(
+        app_id='a' * 10, app_secret='b' * 20, user='user',
+        password='password', targets=['#apprise', 'apprise', '#', 'other'])
+    assert obj.subreddits == ['apprise', 'other']
+    assert len(obj) == 2
+
+
+def test_plugin_reddit_parse_url_flags():
+    """
+    NotifyReddit() URL Flag Parsing
+
+    """
+
+    # Our defaults
+    obj = apprise.Apprise.instantiate(
+        'reddit://user:pass@id/secret/sub/')
+    assert isinstance(obj, NotifyReddit)
+    assert obj.advertisement is False
+    assert obj.nsfw is False
+    assert obj.sendreplies is True
+    assert obj.resubmit is False
+    assert obj.spoiler is False
+
+    # Every flag is applied to our object and survives a url() round trip
+    obj = apprise.Apprise.instantiate(
+        'reddit://user:pass@id/secret/sub/'
+        '?ad=yes&nsfw=yes&replies=no&resubmit=yes&spoiler=yes'
+        '&flair_id=abc&flair_text=Hello%20World')
+    assert isinstance(obj, NotifyReddit)
+    assert obj.advertisement is True
+    assert obj.nsfw is True
+    assert obj.sendreplies is False
+    assert obj.resubmit is True
+    assert obj.spoiler is True
+    assert obj.flair_id == 'abc'
+    assert obj.flair_text == 'Hello World'
+
+    clone = apprise.Apprise.instantiate(obj.url())
+    assert isinstance(clone, NotifyReddit)
+    assert clone.advertisement is True
+    assert clone.sendreplies is False
+
+
+@mock.patch('requests.Session.post')
+def test_plugin_reddit_auto_kind(mock_post):
+    """
+    NotifyReddit() Auto Kind Detection
+
+    """
+
+    good_response = mock.Mock()
+    good_response.content = dumps({
+        "access_token": 'abc123',
+        "token_type": "bearer",
+        "expires_in": 100000,
+        "scope": '*',
+        "refresh_token": 'def456',
+        # The below is used in the response:
+        "json": {
+            # No errors during post
+            "errors": [],
+        },
+    })
+    good_response.status_code = requests.codes.ok
+    good_response.headers = {}
+
+    # Prepare Mock
+    mock_post.return_value = good_response
+
+    obj = NotifyReddit(
+        app_id='a' * 10, app_secret='b' * 20, user='user',
+        password='password', targets='apprise')
+
+    for body, kind in (
+            ('https://example.com/path', 'link'),
+            ('  HTTP://example.com', 'link'),
+            ('https://example.com followed by text', 'self'),
+            ('http://', 'self'),
+            ('ftp://example.com', 'self'),
+            ('test', 'self')):
+
+        mock_post.reset_mock()
+        assert obj.send(body=body) is True
+        payload = mock_post.call_args[1]['data']
+        assert payload['kind'] == kind
+        assert payload['url' if kind == 'link' else 'text'] == body
+
+    # Each subreddit receives its own copy of our payload
+    obj = NotifyReddit(
+        app_id='a' * 10, app_secret='b' * 20, user='user',
+        password='password', targets=['apprise', 'other'])
+
+    mock_post.reset_mock()
+    assert obj.send(body='test', title='title') is True
+    assert mock_post.call_count == 3
+    first = mock_post.call_args_list[1][1]['data']
+    second = mock_post.call_args_list[2][1]['data']
+    assert first['sr'] == 'apprise'
+    assert second['sr'] == 'other'
+    assert first is not second
+    del first['sr'], second['sr']
+    assert first == second
+
+
+@mock.patch('requests.Session.post')
+def test_plugin_reddit_empty_response(mock_post):
+    """
+    NotifyReddit() Empty Response Handling
+
+    """
+
+    obj = NotifyReddit(
+        app_id='a' * 10, app_secret='b' * 20, user='user',
+        password='password', targets='apprise')
+
+    for content in (b'', None):
+        response = mock.Mock()
+        response.content = content
+        response.status_code = 401
+        response.headers = {}
+        mock_post.return_value = response
+
+        # There is nothing to parse; we fail on our status code alone
+        with mock.patch('apprise.plugins.reddit.loads') as mock_loads:
+            assert obj.login() is False
+            assert mock_loads.call_count == 0
+
+        assert obj.send(body="test") is False
+
+
+def test_plugin_reddit_session():
+    """
+    NotifyReddit() Connection Re-use
+
+    """
+
+    robj = mock.Mock()
+    robj.content = dumps({
+        "access_token": 'abc123',
+        "expires_in": 100000,
+        "json": {
+            "errors": [],
+        },
+    })
+    robj.status_code = requests.codes.ok
+    robj.headers = {}
+
+    with mock.patch('requests.Session') as mock_session:
+        session = mock_session.return_value.__enter__.return_value
+        session.post.return_value = robj
+
+        obj = NotifyReddit(
+            app_id='a' * 10, app_secret='b' * 20, user='user',
+            password='password', targets=('apprise', 'other'))
+
+        # No connection is opened until we notify
+        assert mock_session.call_count == 0
+
+        # Our login and both subreddits share the same connection
+        assert obj.send(body="test") is True
+        assert mock_session.call_count == 1
+        assert session.post.call_count == 3
+
+        # Each notification opens (and closes) its own connection
+        assert obj.send(body="test") is True
+        assert mock_session.call_count == 2
+        assert mock_session.return_value.__exit__.call_count == 2
+        assert session.post.call_count == 5
+
+
+@mock.patch('requests.Session.post')
+def test_plugin_reddit_token_expiry(mock_post):
+    """
+    NotifyReddit() Token Expiry
+
+    """
+
+    good_response = mock.Mock()
+    good_response.content = dumps({
+        "access_token": 'abc123',
+        "token_type": "bearer",
+        "expires_in": 100000,
+        "scope": '*',
+        "refresh_token": 'def456',
+        # The below is used in the response:
+        "json": {
+            # No errors during post
+            "errors": [],
+        },
+    })
+    good_response.status_code = requests.codes.ok
+    good_response.headers = {}
+
+    # Prepare Mock
+    mock_post.return_value = good_response
+
+    obj = NotifyReddit(
+        app_id='a' * 10, app_secret='b' * 20, user='user',
+        password='password', targets='apprise')
+
+    # We login and then post our notification
+    assert obj.send(body="test") is True
+    assert mock_post.call_count == 2
+    assert mock_post.call_args_list[0][0][0] == \
+        'https://www.reddit.com/api/v1/access_token'
+    assert mock_post.call_args_list[1][0][0] == \
+        'https://oauth.reddit.com/api/submit'
+
+    # We authenticate with our credentials, then post with our token
+    assert mock_post.call_args_list[0][1]['auth'] == ('a' * 10, 'b' * 20)
+    assert 'Authorization' not in mock_post.call_args_list[0][1]['headers']
+    assert mock_post.call_args_list[1][1]['auth'] is None
+    assert mock_post.call_args_list[1][1]['headers']['Authorization'] == \
+        'Bearer abc123'
+
+    # Our expiry was derived from the expires_in value we were given
+    expiry = obj._NotifyReddit__access_token_expiry
+    assert isinstance(expiry, float)
+    assert time.time() + 99000 < expiry \
+        <= time.time() + 100000 - NotifyReddit.clock_skew
+
+    # Our token is re-used while it is still valid
+    mock_post.reset_mock()
+    assert obj.send(body="test") is True
+    assert mock_post.call_count == 1
+    assert mock_post.call_args_list[0][0][0] == \
+        'https://oauth.reddit.com/api/submit'
+
+    # Expire our token; we acquire a new one before posting
+    obj._NotifyReddit__access_token_expiry = time.time() - 1
+
+    mock_post.reset_mock()
+    assert obj.send(body="test") is True
+    assert mock_post.call_count == 2
+    assert mock_post.call_args_list[0][0][0] == \
+        'https://www.reddit.com/api/v1/access_token'
+    assert mock_post.call_args_list[1][0][0] == \
+        'https://oauth.reddit.com/api/submit'
+
+    # Our refresh token was used to acquire our new access token
+    assert mock_post.call_args_list[0][1]['data'] == {
+        'grant_type': 'refresh_token',
+        'refresh_token': 'def456',
+    }
+
+    # Our token is rejected; we login again and retry our post with the
+    # token we were just given
+    bad_response = mock.Mock()
+    bad_response.content = dumps({})
+    bad_response.status_code = 401
+    bad_response.headers = {}
+
+    new_response = mock.Mock()
+    new_response.content = dumps({
+        "access_token": 'ghi789',
+        "token_type": "bearer",
+        "expires_in": 100000,
+        "scope": '*',
+        "json": {
+            "errors": [],
+        },
+    })
+    new_response.status_code = requests.codes.ok
+    new_response.headers = {}
+
+    mock_post.reset_mock()
+    mock_post.return_value = None
+    mock_post.side_effect = (bad_response, new_response, new_response)
+    assert obj.send(body="test") is True
+    assert mock_post.call_count == 3
+    assert mock_post.call_args_list[0][1]['headers']['Authorization'] == \
+        'Bearer abc123'
+    assert mock_post.call_args_list[1][0][0] == \
+        'https://www.reddit.com/api/v1/access_token'
+    assert mock_post.call_args_list[2][0][0] == \
+        'https://oauth.reddit.com/api/submit'
+    assert mock_post.call_args_list[2][1]['auth'] is None
+    assert mock_post.call_args_list[2][1]['headers']['Authorization'] == \
+        'Bearer ghi789'
+
+    # Our refresh token is rejected with a 200 (and no access token); we
+    # fall back to authenticating with our credentials
+    rejected_response = mock.Mock()
+    rejected_response.content = dumps({"error": "invalid_grant"})
+    rejected_response.status_code = requests.codes.ok
+    rejected_response.headers = {}
+
+    password_response = mock.Mock()
+    password_response.content = dumps({
+        "access_token": 'jkl012',
+        "token_type": "bearer",
+        "expires_in": 100000,
+        "scope": '*',
+        "refresh_token": 'mno345',
+        "json": {
+            "errors": [],
+        },
+    })
+    password_response.status_code = requests.codes.ok
+    password_response.headers = {}
+
+    obj._NotifyReddit__access_token_expiry = time.time() - 1
+    assert obj._NotifyReddit__refresh_token == 'def456'
+
+    mock_post.reset_mock()
+    mock_post.side_effect = (
+        rejected_response, password_response, password_response)
+    assert obj.send(body="test") is True
+    assert mock_post.call_count == 3
+    assert mock_post.call_args_list[0][1]['data'] == {
+        'grant_type': 'refresh_token',
+        'refresh_token': 'def456',
+    }
+    assert mock_post.call_args_list[1][1]['data'] == {
+        'grant_type': 'password',
+        'username': 'user',
+        'password': 'password',
+    }
+    assert mock_post.call_args_list[2][0][0] == \
+        'https://oauth.reddit.com/api/submit'
+    assert mock_post.call_args_list[2][1]['headers']['Authorization'] == \
+        'Bearer jkl012'
+    assert obj._NotifyReddit__refresh_token == 'mno345'
+
+    # Both grants are rejected; we don't hold on to the refresh token that
+    # failed us, so our next attempt starts with our credentials
+    obj._NotifyReddit__access_token_expiry = time.time() - 1
+
+    mock_post.reset_mock()
+    mock_post.side_effect = (rejected_response, rejected_response)
+    assert obj.send(body="test") is False
+    assert mock_post.call_count == 2
+    assert obj._NotifyReddit__refresh_token is None
+
+    mock_post.reset_mock()
+    mock_post.side_effect = (password_response, password_response)
+    assert obj.send(body="test") is True
+    assert mock_post.call_count == 2
+    assert mock_post.call_args_list[0][1]['data']['grant_type'] == \
+        'password'
+
+
+@mock.patch('requests.Session.post')
+def test_plugin_reddit_ratelimit(mock_post):
+    """
+    NotifyReddit() Rate Limit Handling
+
+    """
+
+    good_response = mock.Mock()
+    good_response.content = dumps({
+        "access_token": 'abc123',
+        "token_type": "bearer",
+        "expires_in": 100000,
+        "scope": '*',
+        "refresh_token": 'def456',
+        # The below is used in the response:
+        "json": {
+            # No errors during post
+            "errors": [],
+        },
+    })
+    good_response.status_code = requests.codes.ok
+    good_response.headers = {
+        'X-RateLimit-Reset': str(int(time.time()) + 30),
+        'X-RateLimit-Remaining': '0',
+    }
+
+    # Prepare Mock
+    mock_post.return_value = good_response
+
+    obj = NotifyReddit(
+        app_id='a' * 10, app_secret='b' * 20, user='user',
+        password='password', targets='apprise')
+
+    with mock.patch.object(NotifyReddit, 'throttle') as mock_throttle:
+        # Our first request (login) has nothing to wait for
+        assert obj.login() is True
+        assert mock_throttle.call_args[1]['wait'] is None
+
+        # Our rate limit was picked up from our response
+        assert obj.ratelimit_remaining == 0.0
+        assert isinstance(obj.ratelimit_reset, float)
+
+        # We've exhausted our requests; we wait for our reset (plus our
+        # clock skew) before we send our notification
+        assert obj.send(body="test") is True
+        wait = mock_throttle.call_args[1]['wait']
+        assert 28 < wait <= 30 + NotifyReddit.clock_skew
+
+    # Each rate limit header is tracked independently of the other
+    reset = obj.ratelimit_reset
+    good_response.headers = {
+        'X-RateLimit-Reset': 'invalid',
+        'X-RateLimit-Remaining': '5',
+    }
+    with mock.patch.object(NotifyReddit, 'throttle'):
+        assert obj.send(body="test") is True
+    assert obj.ratelimit_remaining == 5.0
+    assert obj.ratelimit_reset == reset
+
+    good_response.headers = {
+        'X-RateLimit-Reset': str(reset + 60),
+    }
+    with mock.patch.object(NotifyReddit, 'throttle'):
+        assert obj.send(body="test") is True
+    assert obj.ratelimit_remaining == 5.0
+    assert obj.ratelimit_reset == reset + 60
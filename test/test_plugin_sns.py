@@ -26,6 +26,10 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import hmac
+from datetime import datetime
+from datetime import timezone
+from hashlib import sha256
 from unittest import mock
 
 import pytest
@@ -107,7 +111,7 @@ def test_plugin_sns_urls():
 
 # We initialize a post object just incase a test fails below
 # we don't want it sending any notifications upstream
-@mock.patch('requests.post')
+@mock.patch('requests.Session.post')
 def test_plugin_sns_edge_cases(mock_post):
     """
     NotifySNS() Edge Cases
@@ -223,6 +227,15 @@ def test_plugin_sns_url_parsing():
     assert 'secret_access_key' in results
     assert TEST_ACCESS_KEY_SECRET == results['secret_access_key']
 
+    # Unicode characters that only case-fold to ASCII are not a region
+    # (\u212a is the Kelvin sign)
+    results = NotifySNS.parse_url('sns://%s/%s/%s/' % (
+        TEST_ACCESS_KEY_ID,
+        TEST_ACCESS_KEY_SECRET,
+        '\u212aa-east-1')
+    )
+    assert results['region_name'] is None
+
 
 def test_plugin_sns_object_parsing():
     """
@@ -250,6 +263,18 @@ def test_plugin_sns_object_parsing():
     assert a.add('sns://oh/yeah/us-west-2/12223334444') is True
     assert len(a) == 3
 
+    # Our targets are sorted into phone numbers and topics
+    obj = NotifySNS(
+        access_key_id=TEST_ACCESS_KEY_ID,
+        secret_access_key=TEST_ACCESS_KEY_SECRET,
+        region_name=TEST_REGION,
+        targets=(
+            '#1234', 'abcd', '12223334444', '+1(333)444-5555', '5678',
+            '#bad!', '(invalid'),
+    )
+    assert sorted(obj.phone) == ['+12223334444', '+13334445555']
+    assert sorted(obj.topics) == ['1234', '5678', 'abcd']
+
 
 def test_plugin_sns_aws_response_handling():
     """
@@ -273,6 +298,25 @@ def test_plugin_sns_aws_response_handling():
     assert response['type'] == 'SingleElement'
     assert response['request_id'] is None
 
+    # Truncated XML does not result in a partial response
+    response = NotifySNS.aws_response_to_dict(
+        '<PublishResponse><RequestId>abcd</RequestId>')
+    assert response['type'] is None
+    assert response['request_id'] is None
+
+    # Namespaces are ignored wherever they are declared
+    response = NotifySNS.aws_response_to_dict(
+        '<aws:PublishResponse xmlns:aws="http://sns.amazonaws.com/">'
+        '<aws:RequestId>abcd</aws:RequestId></aws:PublishResponse>')
+    assert response['type'] == 'PublishResponse'
+    assert response['request_id'] == 'abcd'
+
+    # Empty Elements
+    response = NotifySNS.aws_response_to_dict(
+        '<PublishResponse><RequestId/></PublishResponse>')
+    assert response['type'] == 'PublishResponse'
+    assert response['request_id'] == ''
+
     # Empty String
     response = NotifySNS.aws_response_to_dict('')
     assert response['type'] is None
@@ -328,7 +372,7 @@ def test_plugin_sns_aws_response_handling():
     assert response['error_message'].endswith('required parameter')
 
 
-@mock.patch('requests.post')
+@mock.patch('requests.Session.post')
 def test_plugin_sns_aws_topic_handling(mock_post):
     """
     NotifySNS() AWS Topic Handling
@@ -435,3 +479,173 @@ def test_plugin_sns_aws_topic_handling(mock_post):
     mock_post.return_value = robj
     # We would have failed to make Post
     assert a.notify(title='', body='test') is True
+
+
+def test_plugin_sns_session():
+    """
+    NotifySNS() Connection Re-use
+
+    """
+
+    robj = mock.Mock()
+    robj.text = ''
+    robj.status_code = requests.codes.ok
+
+    with mock.patch('requests.Session') as mock_session:
+        session = mock_session.return_value.__enter__.return_value
+        session.post.return_value = robj
+
+        obj = NotifySNS(
+            access_key_id=TEST_ACCESS_KEY_ID,
+            secret_access_key=TEST_ACCESS_KEY_SECRET,
+            region_name=TEST_REGION,
+            targets=('+18005559999', '+18005558888'),
+        )
+
+        # No connection is opened until we notify
+        assert mock_session.call_count == 0
+
+        # A single session carries every post of a notification
+        assert obj.notify(body='test') is True
+        assert mock_session.call_count == 1
+        assert session.post.call_count == 2
+
+        # Each notification opens (and closes) its own session
+        assert obj.notify(body='test') is True
+        assert mock_session.call_count == 2
+        assert mock_session.return_value.__exit__.call_count == 2
+        assert session.post.call_count == 4
+
+
+def test_plugin_sns_signing_key():
+    """
+    NotifySNS() Signing Key Derivation
+
+    """
+
+    def signature(date, to_sign):
+        key = ('AWS4' + TEST_ACCESS_KEY_SECRET).encode('utf-8')
+        for msg in (date, TEST_REGION, 'sns', 'aws4_request', to_sign):
+            key = hmac.new(key, msg.encode('utf-8'), sha256).digest()
+        return key.hex()
+
+    obj = NotifySNS(
+        access_key_id=TEST_ACCESS_KEY_ID,
+        secret_access_key=TEST_ACCESS_KEY_SECRET,
+        region_name=TEST_REGION,
+        targets='+18005559999',
+    )
+
+    day1 = datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+    day2 = datetime(2024, 1, 2, 10, tzinfo=timezone.utc)
+
+    assert obj.aws_auth_signature('abc', day1) == signature('20240101', 'abc')
+    key = obj._aws_signing_key
+    assert key[0] == '20240101'
+
+    # Our signing key is re-used for the rest of the day
+    assert obj.aws_auth_signature('def', day1) == signature('20240101', 'def')
+    assert obj._aws_signing_key is key
+
+    # A new day results in a new signing key
+    assert obj.aws_auth_signature('abc', day2) == signature('20240102', 'abc')
+    assert obj._aws_signing_key[0] == '20240102'
+
+
+def test_plugin_sns_prepare_request():
+    """
+    NotifySNS() AWS Request Signing
+
+    """
+
+    obj = NotifySNS(
+        access_key_id=TEST_ACCESS_KEY_ID,
+        secret_access_key=TEST_ACCESS_KEY_SECRET,
+        region_name=TEST_REGION,
+        targets='+18005559999',
+    )
+
+    payload = 'Action=Publish&Message=test&Version=2010-03-31'
+    reference = datetime(2024, 1, 1, 10, 20, 30, tzinfo=timezone.utc)
+
+    with mock.patch('apprise.plugins.sns.datetime') as mock_datetime:
+        mock_datetime.now.return_value = reference
+        headers = obj.aws_prepare_request(payload)
+
+    content_type = 'application/x-www-form-urlencoded; charset=utf-8'
+    assert headers['Content-Type'] == content_type
+    assert headers['Content-Length'] == str(len(payload))
+    assert headers['X-Amz-Date'] == '20240101T102030Z'
+
+    # Our signature for the fixed credentials, payload and time above was
+    # computed independently (with hmac/sha256) and is pinned here so that
+    # a regression in our canonical request, key derivation or aws_sign()
+    # is caught
+    assert headers['Authorization'] == (
+        'AWS4-HMAC-SHA256 Credential={}/20240101/{}/sns/aws4_request, '
+        'SignedHeaders=content-type;host;x-amz-date, '
+        'Signature=716efc104ae555edc2c6754149a80b47'
+        '75a3231c352e2f056148151964a6b370'.format(
+            TEST_ACCESS_KEY_ID, TEST_REGION))
+
+
+@mock.patch('requests.Session.post')
+def test_plugin_sns_topic_arn_cache(mock_post):
+    """
+    NotifySNS() Topic ARN Caching
+
+    """
+
+    arn_response = mock.Mock()
+    arn_response.status_code = requests.codes.ok
+    arn_response.text = \
+        """
+         <CreateTopicResponse xmlns="http://sns.amazonaws.com/doc/2010-03-31/">
+           <CreateTopicResult>
+             <TopicArn>arn:aws:sns:us-east-1:000000000000:abcd</TopicArn>
+                </CreateTopicResult>
+        </CreateTopicResponse>
+        """
+
+    good_response = mock.Mock()
+    good_response.status_code = requests.codes.ok
+    good_response.text = ''
+
+    bad_response = mock.Mock()
+    bad_response.status_code = requests.codes.not_found
+    bad_response.text = ''
+
+    def actions():
+        return [
+            'CreateTopic' if 'Action=CreateTopic' in call[1]['data']
+            else 'Publish' for call in mock_post.call_args_list]
+
+    obj = NotifySNS(
+        access_key_id=TEST_ACCESS_KEY_ID,
+        secret_access_key=TEST_ACCESS_KEY_SECRET,
+        region_name=TEST_REGION,
+        targets='#TopicA',
+    )
+
+    # Our first notification resolves our topic
+    mock_post.side_effect = (arn_response, good_response)
+    assert obj.notify(body='test') is True
+    assert actions() == ['CreateTopic', 'Publish']
+
+    # Our resolved topic is re-used
+    mock_post.reset_mock()
+    mock_post.side_effect = (good_response, )
+    assert obj.notify(body='test') is True
+    assert actions() == ['Publish']
+
+    # A failed publish forgets our topic
+    mock_post.reset_mock()
+    mock_post.side_effect = (bad_response, )
+    assert obj.notify(body='test') is False
+    assert actions() == ['Publish']
+
+    # So it is looked up again
+    mock_post.reset_mock()
+    mock_post.side_effect = (arn_response, good_response)
+    assert obj.notify(body='test') is True
+    assert actions() == ['CreateTopic', 'Publish']